@@ -6,47 +6,64 @@
 #  version ='1.2.1'
 #  -------------------------------------------------------------------------
 
-import argparse
 import logging
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from src.app import CLIAccessManager, Function, GetInputTimedOut
-from src.encrypter import Encrypter
 from src.logging_utils import setup_logging
 
+if TYPE_CHECKING:
+    import argparse
+
 APP_DIR = Path(__file__).parent
 CONFIG_FILE_PATH = APP_DIR / "config.conf"
 LOG_FILE_PATH = APP_DIR / "access.log"
-SEARCH_VALUE_PATTERN = r".{3,}"
-ADD_VALUE_PATTERN = r"^\S{3,} \S{3,} \S{3,}( \S{3,40})?$"
+LOG_SEPARATOR = "\n" + 150 * "="
+# values of src.app.Function, listed here so argument parsing does not import src.app
+MODES = ("search", "add", "remove")
 
 _log = logging.getLogger("main")
 
-setup_logging(LOG_FILE_PATH)
 
+def parse_args() -> "argparse.Namespace":
+    import argparse
 
-def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Manage encrypted file credentials")
-    parser.add_argument(
+    mode_group = parser.add_mutually_exclusive_group()
+    mode_group.add_argument(
         "-s",
         "--search",
         help="Search credentials for a pattern",
-        action="store_true",
+        action="store_const",
+        dest="function",
+        const="search",
     )
-    parser.add_argument(
+    mode_group.add_argument(
         "-a",
         "--add",
         help="Update the existing credential base and save it into a new file. "
         "Input credentials, like 'gmail.com mylogin 12345678 authentication'. The last value is default.",
-        action="store_true",
+        action="store_const",
+        dest="function",
+        const="add",
     )
-    parser.add_argument(
+    mode_group.add_argument(
         "-r",
         "--remove",
         help="Remove credentials from the base and save the base into a new file.",
-        action="store_true",
+        action="store_const",
+        dest="function",
+        const="remove",
+    )
+    mode_group.add_argument(
+        "-m",
+        "--mode",
+        help="Select the mode by name, same as the -s/-a/-r flags",
+        choices=MODES,
+        dest="function",
     )
+    parser.set_defaults(function="search")
     parser.add_argument(
         "-w",
         "--work_path",
@@ -67,19 +84,18 @@ def set_debug_mode() -> None:
 
 def main() -> None:
     input_args = parse_args()
+    setup_logging(LOG_FILE_PATH)
+    # imported after parsing arguments, so '--help' does not load gnupg
+    from src.app import CLIAccessManager, Function, GetInputTimedOut, InputStreamClosed
+    from src.encrypter import Encrypter
+
     access = CLIAccessManager(Encrypter, config_path=CONFIG_FILE_PATH, work_path=input_args.work_path)
     try:
         if input_args.debug:
             set_debug_mode()
-        if input_args.add:
-            access.run_function_with_result_save(Function.ADD)
-        elif input_args.remove:
-            access.run_function_with_result_save(Function.REMOVE)
-        else:
-            access.run_function_with_result_save(Function.SEARCH)
-
-    except GetInputTimedOut as e:
-        _log.info(f"Did not get input value: {e}")
+        access.run_function_with_result_save(Function(input_args.function))
+    except (GetInputTimedOut, InputStreamClosed) as e:
+        _log.info("Did not get input value: %s", e)
     except KeyboardInterrupt:
         sys.exit(0)
     except Exception:
@@ -87,7 +103,7 @@ def main() -> None:
         sys.exit(1)
     finally:
         access.write_config()
-        _log.debug(f"\n{150 * '='}")
+        _log.debug(LOG_SEPARATOR)
 
 
 if __name__ == "__main__":
@@ -5,21 +5,31 @@
 #  -------------------------------------------------------------------------
 import json
 import logging
+import os
 import re
 import select
 import sys
+import time
 from enum import IntEnum, Enum
 from pathlib import Path
-from subprocess import call, DEVNULL
-from typing import Type, Dict, Union, Optional, List
+from typing import Callable, Type, Dict, Union, Optional, List, Pattern
 
 from src.encrypter import Encrypter
 
 _log = logging.getLogger(__name__)
 
-SEARCH_VALUE_PATTERN = r".{3,}"
-ADD_VALUE_PATTERN = r"^\S{3,} \S{3,} \S{3,}( \S{3,40})?$"
+SEARCH_VALUE_PATTERN = re.compile(r".{3,}")
+ADD_VALUE_PATTERN = re.compile(r"\S{3,} \S{3,} \S{3,}( \S{3,40})?")
+# none of the input patterns accept shorter values
+MIN_INPUT_LENGTH = 3
 DEFAULT_WORK_DIR = Path().absolute()
+# ANSI escape sequences, equivalent of "tput cuu 1 && tput ed"
+CLEAR_PREVIOUS_LINE = "\x1b[1A\x1b[J"
+# equivalent of "clear"
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+# equivalents of "tput smcup" and "tput rmcup" for xterm-256color
+ENTER_ALTERNATE_SCREEN = "\x1b[?1049h"
+EXIT_ALTERNATE_SCREEN = "\x1b[?1049l"
 
 JsonContent = Dict[str, Union[str, int]]
 
@@ -29,6 +39,11 @@ class GetInputTimedOut(Exception):
         super().__init__(f"Timeout {timeout}s reached when waiting for input value")
 
 
+class InputStreamClosed(Exception):
+    def __init__(self) -> None:
+        super().__init__("Input stream has been closed")
+
+
 class Function(Enum):
     SEARCH = "search"
     ADD = "add"
@@ -36,32 +51,47 @@ class Function(Enum):
     UNDEFINED = "undefined"
 
 
+FUNCTION_VALUES = frozenset(v.value for v in Function)
+
+
 class Color(IntEnum):
     DEFAULT = 7
     RED = 1
     GREEN = 2
 
 
+# foreground color escape sequences, equivalent of "tput setaf <color>"
+FOREGROUND_COLORS = {color: f"\x1b[3{color.value}m" for color in Color}
+
+
+def _echo(text: str) -> None:
+    """Print a line to the terminal without spawning an 'echo' process"""
+    sys.stdout.write(text + "\n")
+    sys.stdout.flush()
+
+
 class CLIAccessManager:
     def __init__(self, encrypter_class: Type[Encrypter], *, config_path: Path, work_path: Optional[Path] = None):
         self._encrypter_class = encrypter_class
         self._config_path = config_path
         self._config = self._read_config()
-        self._handle_work_path(work_path)
+        # config content as it is in the file, to skip rewriting unchanged config
+        self._saved_config = dict(self._config)
+        self._work_dir = self._handle_work_path(work_path)
         self._encrypter: Optional[Encrypter] = None
 
-    def _handle_work_path(self, path: Optional[Path] = None) -> None:
+    def _handle_work_path(self, path: Optional[Path] = None) -> Path:
         if path is None and not self._config.get("work_dir", False):
             path = DEFAULT_WORK_DIR
-            _log.warning(f"Work path not provided. A default one is used: {path}")
-        if path is not None:
-            if path.is_file():
-                path = path.parent
-            elif path.is_dir():
-                path = path
-            else:
-                raise ValueError(f"Wrong path passed: {path}")
-            self._config.update({"work_dir": str(path)})
+            _log.warning("Work path not provided. A default one is used: %s", path)
+        if path is None:
+            return Path(str(self._config["work_dir"]))
+        if path.is_file():
+            path = path.parent
+        elif not path.is_dir():
+            raise ValueError(f"Wrong path passed: {path}")
+        self._config.update({"work_dir": str(path)})
+        return path
 
     @staticmethod
     def _create_config_file(path: Path) -> Path:
@@ -69,74 +99,76 @@ class CLIAccessManager:
             return path
 
     def _read_config(self) -> JsonContent:
-        if not self._config_path.exists():
-            _log.warning(f'Config file path "{self._config_path}" does not exist. Creating empty file...')
+        try:
+            f = open(self._config_path, "r", encoding="utf8")
+        except FileNotFoundError:
+            _log.warning('Config file path "%s" does not exist. Creating empty file...', self._config_path)
             self._create_config_file(self._config_path)
             return {}
-        with open(self._config_path, "r", encoding="utf8") as f:
-            content = f.read()
-            if not content:
+        with f:
+            # an empty file is an empty config, json.load would reject it
+            if not os.fstat(f.fileno()).st_size:
                 return {}
-            config_dict = json.loads(content)
-            assert isinstance(config_dict, dict)
-            return config_dict
+            config_dict = json.load(f)
+        assert isinstance(config_dict, dict)
+        return config_dict
 
     def write_config(self) -> None:
+        if self._config == self._saved_config:
+            _log.debug("Config has not been changed. Skip writing the file: %s", self._config_path)
+            return
         with open(self._config_path, "w+", encoding="utf-8") as f:
-            json.dump(self._config, f)
-        _log.debug(f"All config data has been written to the file: {self._config_path}")
+            json.dump(self._config, f, separators=(",", ":"), ensure_ascii=False)
+        self._saved_config = dict(self._config)
+        _log.debug("All config data has been written to the file: %s", self._config_path)
 
     @staticmethod
     def show_data_safely(data: List[str], color: Color = Color.DEFAULT, timeout: int = 5) -> None:
         try:
-            call(["tput", "smcup", "-T", "xterm-256color"], timeout=5)
-            call(["tput", "setaf", f"{color.value}"], timeout=5)
-            call(["echo", "\n\n".join(data)], timeout=5, stderr=DEVNULL)
-            call(f"sleep 5", shell=True, timeout=6)
+            sys.stdout.write(ENTER_ALTERNATE_SCREEN + FOREGROUND_COLORS[color] + "\n\n".join(data) + "\n")
+            sys.stdout.flush()
+            time.sleep(timeout)
         except Exception:
-            call("clear", shell=True, timeout=5)
-            _log.error(f"Error when show a message")
+            sys.stdout.write(CLEAR_SCREEN)
+            _log.error("Error when show a message")
         finally:
-            call(["tput", "setaf", f"{Color.DEFAULT.value}"], timeout=5)
-            call(["tput", "rmcup", "-T", "xterm-256color"], timeout=5)
+            sys.stdout.write(FOREGROUND_COLORS[Color.DEFAULT] + EXIT_ALTERNATE_SCREEN)
+            sys.stdout.flush()
 
     # TODO: change prompt
     def run_function_with_result_save(self, selected_function: Function = Function.UNDEFINED) -> None:
-        work_path = self._config.get("work_dir", None)
-        assert work_path is not None, "Missing work path for build Encrypter class instance"
-
-        with self._encrypter_class(Path(str(work_path))) as encrypter:
+        handlers: Dict[Function, Callable[[Encrypter], bool]] = {
+            Function.SEARCH: self.search_credentials,
+            Function.ADD: self.add_credentials,
+            Function.REMOVE: self.remove_credentials,
+        }
+        with self._encrypter_class(self._work_dir) as encrypter:
             while True:
                 if selected_function == Function.UNDEFINED:
                     input_value = input("Please enter 'search', 'add' or 'remove' to continue: ")
-                    if input_value not in [v.value for v in Function]:
-                        call(["echo", "Wrong input"], timeout=5)
+                    if input_value not in FUNCTION_VALUES:
+                        _echo("Wrong input")
                         continue
                     selected_function = Function(input_value)
 
-                if selected_function == Function.SEARCH:
-                    repeat_call = self.search_credentials(encrypter)
-                elif selected_function == Function.ADD:
-                    repeat_call = self.add_credentials(encrypter)
-                elif selected_function == Function.REMOVE:
-                    repeat_call = self.remove_credentials(encrypter)
-                else:
+                handler = handlers.get(selected_function)
+                if handler is None:
                     raise RuntimeError("Unhandled exception")
-                if not repeat_call:
+                if not handler(encrypter):
                     selected_function = Function.UNDEFINED
 
     @staticmethod
-    def _is_input_valid(value: str, pattern: str) -> bool:
-        if re.match(pattern, value):
-            return True
-        call(["echo", "Input phrase is not valid"])
-        return False
+    def _is_input_valid(value: str, pattern: Pattern[str]) -> bool:
+        is_valid = len(value) >= MIN_INPUT_LENGTH and pattern.fullmatch(value) is not None
+        if not is_valid:
+            _echo("Input phrase is not valid")
+        return is_valid
 
     def add_credentials(self, encrypter: Encrypter) -> bool:
         input_message = "ADDING MODE. Please input new credentials:"
         input_value = self.get_input_value_safely(input_message, timeout=60)
         if input_value == "exit":
-            call(["echo", "Exit adding mode"])
+            _echo("Exit adding mode")
             return False
         if input_value and self._is_input_valid(value=input_value, pattern=ADD_VALUE_PATTERN):
             encrypter.add_content(input_value)
@@ -144,13 +176,13 @@ class CLIAccessManager:
 
     def search_credentials(self, encrypter: Encrypter) -> bool:
         input_message = "SEARCHING MODE. Type min 3 ch to search:"
-        input_value = self.get_input_value_safely(input_message).lower()
-        if input_value == "exit":
-            call(["echo", "Exit searching mode"])
+        input_value = self.get_input_value_safely(input_message)
+        if input_value.lower() == "exit":
+            _echo("Exit searching mode")
             return False
         if input_value and self._is_input_valid(value=input_value, pattern=SEARCH_VALUE_PATTERN):
             found = encrypter.search_in_content(input_value)
-            call(["echo", f"Found {len(found)} credentials"], timeout=5)
+            _echo(f"Found {len(found)} credentials")
             if found:
                 self.show_data_safely([str(item) for item in found], color=Color.GREEN)
         return True
@@ -159,27 +191,32 @@ class CLIAccessManager:
         input_message = "REMOVING MODE. Please input credentials pattern to remove:"
         input_pattern = self.get_input_value_safely(input_message, timeout=60)
         if input_pattern == "exit":
-            call(["echo", "Exit removing mode"])
+            _echo("Exit removing mode")
             return False
         if input_pattern:
-            credentials_to_remove = encrypter.search_in_content(pattern=input_pattern)
-            call(["echo", f"Found {len(credentials_to_remove)} credentials"], timeout=5)
+            credentials_to_remove = encrypter.search_in_content(pattern=input_pattern, ignore_case=False)
+            _echo(f"Found {len(credentials_to_remove)} credentials")
             if credentials_to_remove:
                 self.show_data_safely([str(c) for c in credentials_to_remove], Color.RED)
                 remove_message = "Enter 'yes' to remove or any key to cancel: "
                 if input(remove_message) == "yes":
                     removed = encrypter.remove_credentials(pattern=input_pattern)
-                    call(["echo", f"{removed} credentials sets have been removed"], timeout=5)
+                    _echo(f"{removed} credentials sets have been removed")
                 else:
-                    call(["echo", "Skip removing"], timeout=5)
+                    _echo("Skip removing")
         return True
 
     # TODO: clear screen in case of exception
     @staticmethod
     def get_input_value_safely(text: str, timeout: int = 30) -> str:
-        call(["echo", text], timeout=5)
+        _echo(text)
+        # select() rather than epoll: stdin may be redirected from a regular file, which epoll refuses
         input_value, _, _ = select.select([sys.stdin], [], [], timeout)
-        call("tput cuu 1 && tput ed", shell=True, timeout=5)
+        sys.stdout.write(CLEAR_PREVIOUS_LINE)
+        sys.stdout.flush()
         if input_value:
-            return sys.stdin.readline().strip()
+            line = sys.stdin.readline()
+            if not line:
+                raise InputStreamClosed()
+            return line.strip()
         raise GetInputTimedOut(timeout)
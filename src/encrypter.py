@@ -4,15 +4,17 @@
 #  version ='1.2.3'
 #  -------------------------------------------------------------------------
 
-import io
+import hashlib
+import heapq
 import logging
 import os
 import re
 import uuid
 from datetime import datetime
+from functools import cached_property, lru_cache
 from pathlib import Path
 from types import TracebackType
-from typing import List, Optional, Type
+from typing import ClassVar, Iterable, List, Optional, Pattern, Tuple, Type
 
 import gnupg  # type: ignore
 from dataclasses import dataclass, fields
@@ -20,6 +22,14 @@ from dataclasses import dataclass, fields
 _log = logging.getLogger(__name__)
 
 FILE_ITEMS_SEPARATOR = "\n"
+DATE_PATTERN = re.compile(r"\d{2}\.\d{2}\.\d{4}")
+REGEX_SPECIAL_CHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+
+@lru_cache(maxsize=128)
+def _compile_search_pattern(pattern: str, ignore_case: bool) -> Pattern[str]:
+    """Remove mode searches the same pattern twice (to show and to remove), compile it once"""
+    return re.compile(pattern, flags=re.IGNORECASE if ignore_case else 0)
 
 
 @dataclass(frozen=True)
@@ -30,38 +40,75 @@ class Credentials:
     password: str
     kind: str = "authentication"
     updated_on: str = datetime.today().strftime("%d.%m.%Y")
+    # number of values in a text line: every field except id, the last two are optional
+    max_values_count: ClassVar[int]
+    min_values_count: ClassVar[int]
 
     def __post_init__(self) -> None:
-        for field in fields(self):
-            field_value = getattr(self, field.name)
-            if isinstance(field_value, str) and field_value.count(" "):
-                raise ValueError(f"Field '{field.name}' shouldn't contain spaces")
-        if not re.match(r"\d\d.\d\d.\d\d\d\d", self.updated_on):
+        string_fields = (
+            ("resource", self.resource),
+            ("login", self.login),
+            ("password", self.password),
+            ("kind", self.kind),
+            ("updated_on", self.updated_on),
+        )
+        for field_name, field_value in string_fields:
+            if " " in field_value:
+                raise ValueError(f"Field '{field_name}' shouldn't contain spaces")
+        if not DATE_PATTERN.match(self.updated_on):
             raise ValueError(f"Wrong date string: {self.updated_on}")
 
     @classmethod
-    def from_string(cls, string_value: str, id_start_from: int = 1) -> List["Credentials"]:
+    def _from_lines(cls, lines: Iterable[str], id_start_from: int) -> List["Credentials"]:
         credentials = []
-        for i, line in enumerate(string_value.strip().split(FILE_ITEMS_SEPARATOR), start=id_start_from):
-            try:
-                credentials.append(cls(i, *line.split()))
-            except Exception:
-                _log.error(f"Invalid line {i}. Skip parsing the line")
+        for i, line in enumerate(lines, start=id_start_from):
+            values = line.split()
+            if cls.min_values_count <= len(values) <= cls.max_values_count:
+                try:
+                    credentials.append(cls(i, *values))
+                    continue
+                except ValueError:
+                    pass
+            _log.error("Invalid line %d. Skip parsing the line", i)
         return credentials
 
+    @classmethod
+    def from_string(cls, string_value: str, id_start_from: int = 1) -> List["Credentials"]:
+        return cls._from_lines(string_value.strip().split(FILE_ITEMS_SEPARATOR), id_start_from=id_start_from)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, id_start_from: int = 1) -> List["Credentials"]:
+        """Decode line by line, the whole content is never held as one decoded string.
+        Leading and trailing blank lines are ignored, as in from_string"""
+        # split like from_string: only on the separator, a trailing "\r" is dropped by the per-line split()
+        lines = data.strip().split(FILE_ITEMS_SEPARATOR.encode("utf8"))
+        return cls._from_lines((line.decode("utf8") for line in lines), id_start_from=id_start_from)
+
     @classmethod
     def from_file(cls, path: Path, id_start_from: int = 1) -> List["Credentials"]:
-        with open(path, "r", encoding="utf8") as f:
-            return cls.from_string(f.read(), id_start_from=id_start_from)
+        return cls.from_bytes(path.read_bytes(), id_start_from=id_start_from)
 
     def as_line(self) -> str:
-        values = [getattr(self, field.name) for field in fields(self) if field.name != "id"]
-        return " ".join(values)
+        return " ".join((self.resource, self.login, self.password, self.kind, self.updated_on))
 
     def __str__(self) -> str:
-        values = [str(getattr(self, field.name)) for field in fields(self)]
+        return self._display_line
+
+    @cached_property
+    def _display_line(self) -> str:
+        """Rendered once, instances are immutable and searches render every item"""
+        values = (str(self.id), self.resource, self.login, self.password, self.kind, self.updated_on)
         return (5 * " ").join(values)
 
+    @cached_property
+    def lowered_line(self) -> str:
+        """Lowercase rendered line for case-insensitive substring search"""
+        return self._display_line.lower()
+
+
+Credentials.max_values_count = len(fields(Credentials)) - 1
+Credentials.min_values_count = Credentials.max_values_count - 2
+
 
 class Encrypter:
     """
@@ -73,11 +120,14 @@ class Encrypter:
     """
 
     ENCRYPTED_FILE_EXTENSION = "gpg"
+    ENCRYPTED_FILE_SUFFIX = "." + ENCRYPTED_FILE_EXTENSION
 
     def __init__(self, path: Path, passphrase: Optional[str] = None):
         self.dir: Optional[Path] = None
         self.encrypted_file_path: Optional[Path] = None
         self._is_content_updated: bool = False
+        # sha256 of the content of "encrypted_file_path", to skip re-encrypting the same content
+        self._encrypted_content_digest: Optional[bytes] = None
         # TODO: provide path to GPG
         self._gpg = gnupg.GPG()
         self.__credentials: List[Credentials] = []
@@ -107,7 +157,7 @@ class Encrypter:
         """
         if path.is_file():
             self.dir = path.parent
-            if not path.name.endswith(self.ENCRYPTED_FILE_EXTENSION):
+            if not path.name.endswith(self.ENCRYPTED_FILE_SUFFIX):
                 self._get_credentials_from_text_file(path)
                 file_to_decrypt = self.find_newest_encrypted_file()
             else:
@@ -121,97 +171,100 @@ class Encrypter:
         if file_to_decrypt is not None:
             self.decrypt_file(path=file_to_decrypt, passphrase=passphrase)
 
-    def _get_sorted_files_by_date_desc(self) -> Optional[List[Path]]:
-        """Search for encrypted files in a directory"""
+    def _find_encrypted_files(self) -> List[Tuple[float, str]]:
+        """Search for encrypted files in a directory, return their modification times and paths"""
         assert self.dir, "Dir path is not set"
-        _log.debug(f'Searching for "{self.ENCRYPTED_FILE_EXTENSION}" files in {self.dir}...')
-        file_paths = [p for p in self.dir.iterdir() if p.name.endswith(self.ENCRYPTED_FILE_EXTENSION)]
-        if not file_paths:
-            _log.warning(f'Encrypted files not found in "{self.dir}"')
-            return None
-        file_paths = sorted(file_paths, key=lambda x: os.path.getmtime(str(x)), reverse=True)
-        max_show_files = 5
-        sorted_several_files = ["\n\t" + str(p) for p in file_paths[:max_show_files]]
-        _log.debug(f'Latest encrypted files: {"".join(sorted_several_files)}')
-        return file_paths
+        _log.debug('Searching for "%s" files in %s...', self.ENCRYPTED_FILE_EXTENSION, self.dir)
+        with os.scandir(self.dir) as entries:
+            return [(e.stat().st_mtime, e.path) for e in entries if e.name.endswith(self.ENCRYPTED_FILE_SUFFIX)]
 
     def find_newest_encrypted_file(self) -> Optional[Path]:
         """Search for newest encrypted file in dir"""
         assert self.dir, "Dir path is not set"
-        paths = self._get_sorted_files_by_date_desc()
-        if not paths:
-            _log.warning(f"Directory {self.dir} does not contain any encrypted files")
+        files = self._find_encrypted_files()
+        if not files:
+            _log.warning("Directory %s does not contain any encrypted files", self.dir)
             return None
-        newest_file_path = paths[0]
-        _log.info(f"Newest encrypted file: {newest_file_path}")
+        if _log.isEnabledFor(logging.DEBUG):
+            max_show_files = 5
+            sorted_several_files = ["\n\t" + p for _, p in heapq.nlargest(max_show_files, files)]
+            _log.debug("Latest encrypted files: %s", "".join(sorted_several_files))
+        newest_file_path = Path(max(files)[1])
+        _log.info("Newest encrypted file: %s", newest_file_path)
         return newest_file_path
 
     def _get_credentials_from_text_file(self, path: Path) -> None:
         self._update_credentials(Credentials.from_file(path, id_start_from=self.items_count() + 1))
-        _log.debug(f"Got credentials of the text file: {path}")
+        _log.debug("Got credentials of the text file: %s", path)
 
     def decrypt_file(self, path: Path, passphrase: Optional[str] = None) -> None:
         """Decrypt a file using 'passphrase' or invoke a modal window"""
-        if not path.is_file() or not path.name.endswith(self.ENCRYPTED_FILE_EXTENSION):
+        if not path.is_file() or not path.name.endswith(self.ENCRYPTED_FILE_SUFFIX):
             raise ValueError(f'Path is not a file or is not "{self.ENCRYPTED_FILE_EXTENSION}" file: {path}')
-        _log.debug(f"Decrypting {path}...")
+        _log.debug("Decrypting %s...", path)
         result = self._gpg.decrypt_file(str(path), passphrase=passphrase)
         if not result.ok:
             raise ValueError("Wrong password")
-        self.encrypted_file_path = path
-        self.__credentials.extend(
-            Credentials.from_string(result.data.decode("utf8"), id_start_from=self.items_count() + 1)
-        )
-        _log.debug(f"Got credentials of the encrypted file: {path}")
+        credentials = Credentials.from_bytes(result.data, id_start_from=self.items_count() + 1)
+        self._encrypted_content_digest = hashlib.sha256(result.data).digest()
+        # release decrypted bytes as soon as they are parsed
         del result
+        self.encrypted_file_path = path
+        self.__credentials.extend(credentials)
+        _log.debug("Got credentials of the encrypted file: %s", path)
 
     def encrypt_into_new_file_if_content_updated(self, passphrase: Optional[str] = None) -> Optional[Path]:
         """Encrypt updated credentials into a new file"""
         if not self._is_content_updated:
             _log.info("Content has not been changed. Skip new file creation")
             return None
+        content = FILE_ITEMS_SEPARATOR.join([c.as_line() for c in self.__credentials]).encode("utf8")
+        content_digest = hashlib.sha256(content).digest()
+        if (
+            content_digest == self._encrypted_content_digest
+            and self.encrypted_file_path is not None
+            and self.encrypted_file_path.exists()
+        ):
+            _log.info("Content is the same as in the encrypted file. Skip new file creation")
+            self._is_content_updated = False
+            return None
         _log.info("Content has been changed. Creating new encrypted file...")
-        content_string = FILE_ITEMS_SEPARATOR.join([c.as_line() for c in self.__credentials])
-        new_encrypted_file_path = self.encrypt_bytes_content_into_file(
-            content=content_string.encode("utf8"), passphrase=passphrase
-        )
-        del content_string
+        new_encrypted_file_path = self.encrypt_bytes_content_into_file(content=content, passphrase=passphrase)
+        self._encrypted_content_digest = content_digest
         self._is_content_updated = False
         self.encrypted_file_path = new_encrypted_file_path
         return new_encrypted_file_path
 
     def encrypt_bytes_content_into_file(self, content: bytes, passphrase: Optional[str] = None) -> Path:
         """Encrypt bytes content into a new file"""
-        v_file = io.BytesIO(initial_bytes=content)
-        del content
         assert self.dir, "Dir path is not set"
         file_path = self._generate_file_path(self.dir)
-        result = self._gpg.encrypt_file(
-            v_file,
+        result = self._gpg.encrypt(
+            content,
             recipients="",
             output=str(file_path),
             symmetric=True,
             passphrase=passphrase,
             extra_args=["--cipher-algo", "AES256"],
         )
-        v_file.close()
         if not result.ok:
             raise RuntimeError(f"Encryption process failed with status: '{result.status}'")
-        _log.info(f"Encrypted file successfully created: {file_path}")
+        _log.info("Encrypted file successfully created: %s", file_path)
         return file_path
 
     def _generate_file_path(self, dir_path: Path) -> Path:
         """Generate unique (within a directory) file name, based on current date
         for an encrypted file (e.g 'access_01012023_5')"""
+        today = datetime.today().strftime("%d%m%Y")
+        existing_names = set(os.listdir(dir_path))
         for i in range(1, 1000):
             ending = f"_{i}" if i > 1 else ""
-            basename = "access_" + datetime.today().strftime("%d%m%Y") + ending
-            file_name = basename + "." + self.ENCRYPTED_FILE_EXTENSION
-            path = dir_path / file_name
-            if not path.exists():
-                return path
-        name = str(uuid.uuid4()) + "." + self.ENCRYPTED_FILE_EXTENSION
-        _log.error(f"All possible file names already exist. Generated a random file name: {name}")
+            basename = "access_" + today + ending
+            file_name = basename + self.ENCRYPTED_FILE_SUFFIX
+            if file_name not in existing_names:
+                return dir_path / file_name
+        name = str(uuid.uuid4()) + self.ENCRYPTED_FILE_SUFFIX
+        _log.error("All possible file names already exist. Generated a random file name: %s", name)
         return dir_path / name
 
     def add_content(self, content: str) -> None:
@@ -222,23 +275,35 @@ class Encrypter:
         if credentials_sets:
             self.__credentials.extend(credentials_sets)
             self._is_content_updated = True
-            _log.debug(f"{len(credentials_sets)} credentials sets have been added to the existing base in memory")
-        _log.debug(f"Total number of credentials in memory: {self.items_count}")
+            _log.debug("%d credentials sets have been added to the existing base in memory", len(credentials_sets))
+        _log.debug("Total number of credentials in memory: %d", self.items_count())
 
     # TODO: return list instead of set. Increase coverage of related tests
-    def search_in_content(self, pattern: str) -> List[Credentials]:
-        """Search for "pattern" in the decrypted file content"""
+    def search_in_content(self, pattern: str, ignore_case: bool = True) -> List[Credentials]:
+        """Search for "pattern" in the decrypted file content, ignoring case unless "ignore_case" is False.
+        A pattern without regex special characters is matched as a lowercase substring, which finds the same
+        items as the equivalent re.IGNORECASE search"""
         if self.__credentials:
-            found = [c for c in self.__credentials if re.search(pattern, str(c))]
-            _log.debug(f"Found {len(found)} credentials sets in memory")
+            if not REGEX_SPECIAL_CHARACTERS.isdisjoint(pattern):
+                search = _compile_search_pattern(pattern, ignore_case).search
+                found = [c for c in self.__credentials if search(str(c))]
+            elif ignore_case:
+                keyword = pattern.lower()
+                found = [c for c in self.__credentials if keyword in c.lowered_line]
+            else:
+                found = [c for c in self.__credentials if pattern in str(c)]
+            _log.debug("Found %d credentials sets in memory", len(found))
             return found
         _log.warning("No content in memory to search in")
         return []
 
     def remove_credentials(self, pattern: str) -> int:
-        found = self.search_in_content(pattern)
-        for item in found:
-            self.__credentials.remove(item)
+        """Remove credentials matching "pattern". Matching is case-sensitive, so removal stays narrow"""
+        found = self.search_in_content(pattern, ignore_case=False)
+        if found:
+            # found items are the stored objects, compare by identity instead of field by field
+            found_ids = {id(c) for c in found}
+            self.__credentials = [c for c in self.__credentials if id(c) not in found_ids]
             self._is_content_updated = True
-        _log.debug(f"{len(found)} credentials sets have been removed successfully")
+        _log.debug("%d credentials sets have been removed successfully", len(found))
         return len(found)
@@ -5,7 +5,9 @@
 #  -------------------------------------------------------------------------
 
 import logging
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict
 
 
 class CustomFormatter(logging.Formatter):
@@ -16,21 +18,28 @@ class CustomFormatter(logging.Formatter):
     bold_red = "\x1b[31;1m"
     reset = "\x1b[0m"
 
+    LEVEL_COLORS = {
+        logging.DEBUG: grey,
+        # logging.INFO: blue,
+        logging.WARNING: yellow,
+        logging.ERROR: red,
+        logging.CRITICAL: bold_red,
+    }
+
     def __init__(self, fmt: str) -> None:
         super().__init__()
         self.fmt = fmt
-        self.FORMATS = {
-            logging.DEBUG: self.grey + self.fmt + self.reset,
-            # logging.INFO: self.blue + self.fmt + self.reset,
-            logging.WARNING: self.yellow + self.fmt + self.reset,
-            logging.ERROR: self.red + self.fmt + self.reset,
-            logging.CRITICAL: self.bold_red + self.fmt + self.reset,
-        }
+        self._formatters = self._get_level_formatters(fmt)
+        self._default_formatter = logging.Formatter(self.fmt)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _get_level_formatters(cls, fmt: str) -> Dict[int, logging.Formatter]:
+        """Colored formatters are created once per format and shared by instances"""
+        return {level: logging.Formatter(color + fmt + cls.reset) for level, color in cls.LEVEL_COLORS.items()}
 
     def format(self, record: logging.LogRecord) -> str:
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
-        return formatter.format(record)
+        return self._formatters.get(record.levelno, self._default_formatter).format(record)
 
 
 def setup_logging(logfile: Path) -> None:
@@ -43,7 +52,7 @@ def setup_logging(logfile: Path) -> None:
     console_handler.setLevel(logging.INFO)
 
     file_formatter = logging.Formatter("%(asctime)s_%(levelname)s:%(name)s:%(lineno)d:%(message)s")
-    file_handler = logging.FileHandler(logfile, "a", encoding="utf-8")
+    file_handler = logging.FileHandler(logfile, "a", encoding="utf-8", delay=True)
     file_handler.setFormatter(file_formatter)
     file_handler.setLevel(logging.DEBUG)
 
@@ -21,6 +21,5 @@ def tmp_dir(tmp_path_factory: Any) -> Path:
 @pytest.fixture(scope="session")
 def txt_file(request: Any, tmp_dir: Path) -> Tuple[Path, str]:
     txt_file_path = tmp_dir / "txt_with_content_example"
-    with open(txt_file_path, "w+", encoding="utf8") as f:
-        f.write(request.param)
+    txt_file_path.write_text(request.param, encoding="utf8")
     return txt_file_path, request.param.split(FILE_ITEMS_SEPARATOR)
@@ -48,6 +48,14 @@ def updated_gpg_file(tmp_dir: Path, gpg_file: TestItems, request: Any) -> Iterat
     os.remove(updated_file_path)
 
 
+@pytest.fixture(scope="class")
+def content_encrypter(tmp_path_factory: Any) -> Encrypter:
+    """Shared by parametrized search tests, which only read the content"""
+    encrypter = Encrypter(tmp_path_factory.mktemp("content"))
+    encrypter.add_content(CONTENT)
+    return encrypter
+
+
 class TestCredentials:
     @pytest.mark.parametrize(
         "row_id, credentials",
@@ -76,6 +84,7 @@ class TestCredentials:
             (2, ("resource_1", "lo gin_1", "password_1")),
             (3, ("resource_1", "login_1", "pas sword_1")),
             (4, ("resource_1", "login_1", "password_1", "kind_1", "0101.2023")),
+            (5, ("resource_1", "login_1", "password_1", "kind_1", "01-01-2023")),
         ],
     )
     def test_should_raise_exception_on_wrong_input_values(
@@ -89,6 +98,28 @@ class TestCredentials:
         sut = Credentials.from_string(content)
         assert len(sut) == len(content.split(FILE_ITEMS_SEPARATOR))
 
+    @pytest.mark.parametrize(
+        "invalid_line",
+        ["", "resource_4 login_4", "resource_4 login_4 password_4 kind_4 01.01.2023 extra", "r l p k 0101.2023"],
+    )
+    def test_should_skip_invalid_lines_of_string(self, invalid_line: str) -> None:
+        content = FILE_ITEMS_SEPARATOR.join([CREDENTIALS_1, invalid_line, CREDENTIALS_2])
+        sut = Credentials.from_string(content)
+        assert [c.as_line() for c in sut] == [CREDENTIALS_1, CREDENTIALS_2]
+        assert [c.id for c in sut] == [1, 3]
+
+    @pytest.mark.parametrize(
+        "content", [CONTENT, CONTENT + "\n", CONTENT + "\n\n", "\n" + CONTENT, CONTENT.replace("\n", "\r\n")]
+    )
+    def test_should_create_credentials_instances_from_bytes(self, content: str) -> None:
+        sut = Credentials.from_bytes(content.encode("utf8"))
+        assert [c.as_line() for c in sut] == CREDENTIALS_SETS
+        assert [c.id for c in sut] == [1, 2, 3]
+
+    @pytest.mark.parametrize("content", [CONTENT, "\n" + CONTENT + "\n\n", "a_1 b_1 c_1\rd_1 e_1 f_1"])
+    def test_should_parse_bytes_and_string_the_same_way(self, content: str) -> None:
+        assert Credentials.from_bytes(content.encode("utf8")) == Credentials.from_string(content)
+
     @pytest.mark.parametrize("txt_file", [CONTENT], indirect=["txt_file"])
     def test_should_create_credentials_instances_from_text_file(self, txt_file: TestItems) -> None:
         txt_path, content = txt_file
@@ -96,10 +127,21 @@ class TestCredentials:
         assert len(sut) > 0
         assert len(sut) == len(content)
 
+    def test_should_create_credentials_instances_from_text_file_with_crlf(self, tmp_path: Path) -> None:
+        txt_path = tmp_path / "crlf.txt"
+        txt_path.write_bytes("\r\n".join(CREDENTIALS_SETS).encode("utf8"))
+        sut = Credentials.from_file(txt_path)
+        assert [c.as_line() for c in sut] == CREDENTIALS_SETS
+
     def test_should_string_instance_properly(self) -> None:
         sut = Credentials(1, "resource_1", "login_1", "password_1", "kind_1", "01.01.2023")
         assert str(sut) == "1     resource_1     login_1     password_1     kind_1     01.01.2023"
 
+    def test_should_keep_instance_equality_with_cached_rendering(self) -> None:
+        sut = Credentials(1, "resource_1", "login_1", "password_1", "kind_1", "01.01.2023")
+        assert str(sut) is str(sut)
+        assert sut == Credentials(1, "resource_1", "login_1", "password_1", "kind_1", "01.01.2023")
+
     @pytest.mark.parametrize(
         "txt_file, updated_gpg_file", [(CONTENT, UPDATE_CONTENT)], indirect=["txt_file", "updated_gpg_file"]
     )
@@ -152,13 +194,27 @@ class TestEncrypter:
     def test_should_select_latest_encrypted_file_from_list_of_ones(self, tmp_path: Path) -> None:
         encrypter = Encrypter(tmp_path)
         file_names = ["dummy_1.gpg", "dummy_2.gpg", "dummy_3.gpg", "dummy_4.gpg", "dummy_5.gpg"]
-        for name in file_names:
+        base_time = time.time()
+        for i, name in enumerate(file_names):
             p = tmp_path / name
             p.write_text("dummy content")
-            time.sleep(0.1)
+            os.utime(p, (base_time + i, base_time + i))
         assert len(list(tmp_path.iterdir())) == len(file_names)
         assert encrypter.find_newest_encrypted_file() == tmp_path / file_names[-1]
 
+    def test_should_ignore_files_without_encrypted_file_suffix(self, tmp_path: Path) -> None:
+        encrypter = Encrypter(tmp_path)
+        (tmp_path / "dummy.gpg").write_text("dummy content")
+        (tmp_path / "dummy_notgpg").write_text("dummy content")
+        assert encrypter.find_newest_encrypted_file() == tmp_path / "dummy.gpg"
+
+    def test_should_generate_file_path_not_existing_in_dir(self, tmp_path: Path) -> None:
+        encrypter = Encrypter(tmp_path)
+        today = datetime.today().strftime("%d%m%Y")
+        for name in [f"access_{today}.gpg", f"access_{today}_2.gpg"]:
+            (tmp_path / name).write_text("dummy content")
+        assert encrypter._generate_file_path(tmp_path) == tmp_path / f"access_{today}_3.gpg"
+
     @pytest.mark.parametrize("txt_file", [CONTENT], indirect=["txt_file"])
     def test_should_find_proper_result_for_keyword(self, gpg_file: TestItems, txt_file: TestItems) -> None:
         gpg_path, content = gpg_file
@@ -186,6 +242,18 @@ class TestEncrypter:
         assert found[0].id == 4
         assert encrypter.encrypted_file_path == updated_gpg_path
 
+    @pytest.mark.parametrize("txt_file", [CONTENT], indirect=["txt_file"])
+    def test_should_skip_encryption_if_content_is_the_same_as_decrypted(
+            self, gpg_file: TestItems, txt_file: TestItems
+    ) -> None:
+        gpg_path, _ = gpg_file
+        encrypter = Encrypter(gpg_path, passphrase=PASSPHRASE)
+        encrypter.add_content(UPDATE_CONTENT)
+        resource, *rest = UPDATE_CONTENT.split()
+        assert encrypter.remove_credentials(pattern=resource) == 1
+        assert encrypter.encrypt_into_new_file_if_content_updated(passphrase=PASSPHRASE) is None
+        assert encrypter.encrypted_file_path == gpg_path
+
     @pytest.mark.parametrize("txt_file", [CONTENT], indirect=["txt_file"])
     def test_should_remove_credentials_from_memory_for_the_pattern(
             self, gpg_file: TestItems, txt_file: TestItems
@@ -200,3 +268,29 @@ class TestEncrypter:
 
         result = encrypter.search_in_content(pattern=resource)
         assert len(result) == 0
+
+    @pytest.mark.parametrize("pattern", ["resource_1", "RESOURCE_1", "Resource_1"])
+    def test_should_search_ignoring_case(self, content_encrypter: Encrypter, pattern: str) -> None:
+        found = content_encrypter.search_in_content(pattern)
+        assert len(found) == 1
+        assert found[0].resource == "resource_1"
+
+    @pytest.mark.parametrize("literal, regex", [("straße", "stra(ß)e"), ("STRASSE", "stras+e")])
+    def test_should_find_same_items_for_literal_and_regex_patterns(
+        self, tmp_path: Path, literal: str, regex: str
+    ) -> None:
+        encrypter = Encrypter(tmp_path)
+        encrypter.add_content("Straße login_1 password_1")
+        assert encrypter.search_in_content(literal) == encrypter.search_in_content(regex)
+
+    def test_should_remove_credentials_matching_case(self, tmp_path: Path) -> None:
+        encrypter = Encrypter(tmp_path)
+        encrypter.add_content("Resource_1 login_1 password_1")
+        assert encrypter.remove_credentials(pattern="resource_1") == 0
+        assert encrypter.remove_credentials(pattern="Resource_1") == 1
+
+    @pytest.mark.parametrize(
+        "pattern, count", [("resource_[12]", 2), ("^1 ", 1), ("login_(1|3)", 2), ("resource_.", 3)]
+    )
+    def test_should_search_for_regex_pattern(self, content_encrypter: Encrypter, pattern: str, count: int) -> None:
+        assert len(content_encrypter.search_in_content(pattern)) == count
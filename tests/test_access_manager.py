@@ -5,12 +5,24 @@
 #  -------------------------------------------------------------------------
 
 import logging
+import os
+import runpy
+import sys
 from pathlib import Path
 from typing import Any, Dict, Tuple, List
 
 import pytest
 
-from src.app import CLIAccessManager, DEFAULT_WORK_DIR
+from src.app import (
+    ADD_VALUE_PATTERN,
+    CLIAccessManager,
+    Color,
+    DEFAULT_WORK_DIR,
+    Function,
+    FUNCTION_VALUES,
+    InputStreamClosed,
+    SEARCH_VALUE_PATTERN,
+)
 from src.encrypter import Encrypter
 
 _log = logging.getLogger(__name__)
@@ -46,6 +58,7 @@ class TestCreateCLIAccessManager:
         assert sut._encrypter_class == Encrypter
         assert sut._config_path == txt_path
         assert sut._config == result
+        assert sut._work_dir == Path(result["work_dir"])
         assert sut._encrypter is None
 
     def test_should_create_instance_from_non_existing_config_path(self, tmp_path: Path) -> None:
@@ -63,7 +76,83 @@ class TestCreateCLIAccessManager:
         sut._config["key"] = "value"
         sut.write_config()
         with open(config_path, "r", encoding="utf-8") as f:
-            assert f.read() == f'{{"work_dir": "{str(DEFAULT_WORK_DIR)}", "key": "value"}}'
+            assert f.read() == f'{{"work_dir":"{str(DEFAULT_WORK_DIR)}","key":"value"}}'
+
+    def test_should_read_config_changed_on_disk(self, tmp_path: Path) -> None:
+        config_path = tmp_path / "config"
+        sut = CLIAccessManager(Encrypter, config_path=config_path)
+        sut.write_config()
+        assert CLIAccessManager(Encrypter, config_path=config_path)._config == sut._config
+        sut._config["key"] = "value"
+        sut.write_config()
+        assert CLIAccessManager(Encrypter, config_path=config_path)._config["key"] == "value"
+
+    def test_should_not_rewrite_unchanged_config(self, tmp_path: Path) -> None:
+        config_path = tmp_path / "config"
+        CLIAccessManager(Encrypter, config_path=config_path).write_config()
+        os.utime(config_path, ns=(0, 0))
+        CLIAccessManager(Encrypter, config_path=config_path).write_config()
+        assert config_path.stat().st_mtime_ns == 0
+
+
+class TestCLIAccessManagerInput:
+    @pytest.mark.parametrize(
+        "value, valid",
+        [
+            ("gmail.com mylogin 12345678", True),
+            ("gmail.com mylogin 12345678 authentication", True),
+            ("gmail.com mylogin", False),
+            ("gmail.com mylogin 12345678 authentication extra", False),
+            ("gmail.com my 12345678", False),
+        ],
+    )
+    def test_should_validate_add_input(self, value: str, valid: bool) -> None:
+        assert CLIAccessManager._is_input_valid(value=value, pattern=ADD_VALUE_PATTERN) is valid
+
+    @pytest.mark.parametrize("value, valid", [("gma", True), ("gmail.com", True), ("gm", False)])
+    def test_should_validate_search_input(self, value: str, valid: bool) -> None:
+        assert CLIAccessManager._is_input_valid(value=value, pattern=SEARCH_VALUE_PATTERN) is valid
+
+    def test_should_ask_for_function_again_on_wrong_name(self, tmp_path: Path, monkeypatch: Any, capsys: Any) -> None:
+        class Stop(Exception):
+            pass
+
+        def search_credentials(encrypter: Encrypter) -> bool:
+            raise Stop()
+
+        input_values = iter(["wrong", "search"])
+        monkeypatch.setattr("builtins.input", lambda prompt: next(input_values))
+        sut = CLIAccessManager(Encrypter, config_path=tmp_path / "config", work_path=tmp_path)
+        monkeypatch.setattr(sut, "search_credentials", search_credentials)
+        with pytest.raises(Stop):
+            sut.run_function_with_result_save(Function.UNDEFINED)
+        assert "Wrong input" in capsys.readouterr().out
+        assert next(input_values, None) is None
+
+    def test_should_accept_every_function_as_cli_mode(self) -> None:
+        # __main__.py cannot be imported by name, load it without running main()
+        main_module = runpy.run_path(str(Path(__file__).parents[1] / "__main__.py"), run_name="access_main")
+        assert set(main_module["MODES"]) == FUNCTION_VALUES - {Function.UNDEFINED.value}
+
+    def test_should_read_input_redirected_from_file(self, tmp_path: Path, monkeypatch: Any) -> None:
+        input_path = tmp_path / "input"
+        input_path.write_text("resource_1 login_1 password_1\n", encoding="utf8")
+        with open(input_path, "r", encoding="utf8") as f:
+            monkeypatch.setattr(sys, "stdin", f)
+            assert CLIAccessManager.get_input_value_safely("prompt") == "resource_1 login_1 password_1"
+            with pytest.raises(InputStreamClosed):
+                CLIAccessManager.get_input_value_safely("prompt")
+
+    @pytest.mark.parametrize("value", ["exit", "Exit", "EXIT"])
+    def test_should_exit_searching_mode_ignoring_case(self, tmp_path: Path, monkeypatch: Any, value: str) -> None:
+        monkeypatch.setattr(CLIAccessManager, "get_input_value_safely", staticmethod(lambda *args, **kwargs: value))
+        sut = CLIAccessManager(Encrypter, config_path=tmp_path / "config", work_path=tmp_path)
+        assert sut.search_credentials(Encrypter(tmp_path)) is False
+
+    def test_should_show_data_on_alternate_screen(self, capsys: Any) -> None:
+        CLIAccessManager.show_data_safely(["line_1", "line_2"], color=Color.GREEN, timeout=0)
+        output = capsys.readouterr().out
+        assert output == "\x1b[?1049h\x1b[32mline_1\n\nline_2\n\x1b[37m\x1b[?1049l"
 
 
 # TODO: Create more tests of access manager